@@ -3,12 +3,36 @@ import re
 import json
 import logging
 import argparse
+import functools
 import datetime as dt
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from arcgis.gis import GIS
 
+try:
+    import orjson
+except ImportError:  # optional: faster encode/decode of QB payloads
+    orjson = None
+
+if orjson is not None:
+    _json_dumps = orjson.dumps
+    _json_loads = orjson.loads
+else:
+    def _json_dumps(obj):
+        return json.dumps(obj, separators=(",", ":")).encode("utf-8")
+
+    _json_loads = json.loads
+
+try:
+    from ciso8601 import parse_datetime as _iso_parse
+except ImportError:  # optional: faster parse of timestamped QB dates
+    def _iso_parse(s):
+        return dt.datetime.fromisoformat(s.replace("Z", "+00:00"))
+
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import time
 
 # Change Log - 03-10-2026
@@ -59,6 +83,7 @@ FIELD_MAPPING = {
 }
 
 QB_TO_ARC_FIELDS = list(FIELD_MAPPING.keys())
+QB_TO_ARC_PAIRS = tuple((qb_label, FIELD_MAPPING[qb_label]) for qb_label in QB_TO_ARC_FIELDS)
 
 # ==== QUICKBASE MDU TABLE REFERENCE AND SETUP ====
 MDU_TABLE_ID = "bva6wfne6"
@@ -113,14 +138,18 @@ METRICS = defaultdict(int)
 RUN_INFO = {"started_utc": None, "ended_utc": None, "duration_sec": None}
 
 
+def _utc_iso():
+    return time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
+
+
 def metrics_start():
-    RUN_INFO["started_utc"] = dt.datetime.utcnow().isoformat(timespec="seconds") + "Z"
-    RUN_INFO["_t0"] = time.time()
+    RUN_INFO["started_utc"] = _utc_iso()
+    RUN_INFO["_t0"] = time.monotonic()
 
 
 def metrics_end():
-    RUN_INFO["ended_utc"] = dt.datetime.utcnow().isoformat(timespec="seconds") + "Z"
-    RUN_INFO["duration_sec"] = int(round(time.time() - RUN_INFO["_t0"]))
+    RUN_INFO["ended_utc"] = _utc_iso()
+    RUN_INFO["duration_sec"] = int(round(time.monotonic() - RUN_INFO["_t0"]))
 
 
 def emit_pad_summary():
@@ -146,6 +175,7 @@ def emit_pad_summary():
             "ofs_set": METRICS["fdh_ofs_set"],
             "ofs_cleared": METRICS["fdh_ofs_cleared"],
             "ofs_skipped_unparseable": METRICS["fdh_ofs_unparseable"],
+            "fields_unchanged": METRICS["fdh_field_unchanged"],
         },
 
         "mdu": {
@@ -154,14 +184,16 @@ def emit_pad_summary():
             "updates_prepared": METRICS["mdu_updates_prepared"],
             "updated_ok": METRICS["mdu_updated_ok"],
             "updated_failed": METRICS["mdu_updated_failed"],
+            "fields_unchanged": METRICS["mdu_field_unchanged"],
         },
 
         "errors": METRICS["errors"],
     }
 
-    log.info("PAD_SUMMARY=%s", json.dumps(payload, separators=(",", ":")))
+    line = _json_dumps(payload).decode("utf-8")
+    log.info("PAD_SUMMARY=%s", line)
     # Optional: also print so PAD can capture stdout easily
-    print("PAD_SUMMARY=" + json.dumps(payload, separators=(",", ":")))
+    print("PAD_SUMMARY=" + line)
 
 def get_gis(args):
     """
@@ -189,92 +221,204 @@ def get_gis(args):
     return gis
 
 
+# ---- Shared HTTP session (keep-alive + retries for Quickbase API) ----
+_SESSION = requests.Session()
+_SESSION.mount("https://", HTTPAdapter(
+    pool_connections=4,
+    pool_maxsize=8,
+    max_retries=Retry(
+        total=3,
+        backoff_factor=0.5,
+        status_forcelist=[429, 500, 502, 503, 504],
+        allowed_methods=frozenset({"GET", "POST"}),  # records/query is a read-only POST
+    ),
+))
+
+QB_TIMEOUT = (5, 60)  # (connect, read) seconds
+
+
 def qb_headers(token):
     return {
         "QB-Realm-Hostname": "omnifiber.quickbase.com",
         "Authorization": f"QB-USER-TOKEN {token}",
-        "Content-Type": "application/json"
+        "Content-Type": "application/json",
+        "Accept-Encoding": "gzip, deflate"
     }
 
 
-def fetch_quickbase_records(token, table_id, qb_fields_dict):
-    log.info("Fetching Quickbase records from %s...", table_id)
+QB_PAGE_SIZE = 5000
 
+
+def _query_quickbase_page(token, table_id, qb_fields_dict, skip, top=QB_PAGE_SIZE):
     url = "https://api.quickbase.com/v1/records/query"
-    payload = {"from": table_id, "select": list(qb_fields_dict.keys())}
+    payload = {
+        "from": table_id,
+        "select": list(qb_fields_dict.keys()),
+        # page on Record ID# so rows edited mid-fetch can't shift between pages
+        "sortBy": [{"fieldId": 3, "order": "ASC"}],
+        "options": {"skip": skip, "top": top}
+    }
 
-    r = requests.post(url, headers=qb_headers(token), data=json.dumps(payload))
+    r = _SESSION.post(url, headers=qb_headers(token), data=_json_dumps(payload), timeout=QB_TIMEOUT)
     r.raise_for_status()
 
-    records = r.json().get("data", [])
-    cleaned = []
+    return _json_loads(r.content)
 
-    for rec in records:
-        row = {}
-        for fid, label in qb_fields_dict.items():
-            val = rec.get(str(fid), {}).get("value")
 
-            # list -> scalar/string
-            if isinstance(val, list):
-                if len(val) == 1:
-                    val = val[0]
-                else:
-                    val = ", ".join([str(x) for x in val if x not in (None, "")])
-
-            # normalize QB null sentinels
-            if isinstance(val, str):
-                s = val.strip()
-                if s in {"<Null>", "<NULL>", "<null>"} or s.lower() in {"null", "none", "n/a"}:
-                    val = None
-                elif s.startswith("<") and s.endswith(">"):
-                    val = None
-                else:
-                    val = s
+# QB null sentinels: any <...> token (<Null>, <NULL>, ...) or null/none/n/a, any case
+_NULL_RE = re.compile(r"(?:<.*>|null|none|n/a)\Z", re.IGNORECASE | re.DOTALL)
 
-            row[label] = val
 
-        cleaned.append(row)
+def _clean_quickbase_record(rec, fields):
+    """fields: [(str(fid), label), ...] prepared once per table by iter_quickbase_records."""
+    row = {}
+    for fid, label in fields:
+        cell = rec.get(fid)
+        val = cell.get("value") if cell else None
 
-    log.info("Quickbase records cleaned: %s", len(cleaned))
-    return cleaned
+        # list -> scalar/string
+        if isinstance(val, list):
+            if len(val) == 1:
+                val = val[0]
+            else:
+                val = ", ".join([str(x) for x in val if x not in (None, "")])
+
+        # normalize QB null sentinels (downstream code relies on this: no empty/sentinel strings)
+        if isinstance(val, str):
+            s = val.strip()
+            if s == "" or _NULL_RE.match(s):
+                val = None
+            else:
+                val = s
+
+        row[label] = val
+
+    return row
+
+
+def iter_quickbase_records(token, table_id, qb_fields_dict, page_size=QB_PAGE_SIZE):
+    """
+    Yield cleaned Quickbase rows page by page (options.skip/top).
+    The next page is requested in the background while the current one is cleaned.
+    """
+    log.info("Fetching Quickbase records from %s...", table_id)
+
+    skip = 0
+    count = 0
+    fields = [(str(fid), label) for fid, label in qb_fields_dict.items()]
+
+    with ThreadPoolExecutor(max_workers=1) as ex:
+        pending = ex.submit(_query_quickbase_page, token, table_id, qb_fields_dict, skip, page_size)
+
+        while pending is not None:
+            body = pending.result()
+            records = body.get("data", []) or []
+            meta = body.get("metadata", {}) or {}
+
+            num = meta.get("numRecords", len(records))
+            total = meta.get("totalRecords")
+            skip += num
+
+            # QB may cap a page below `top`; keep going until totalRecords is reached
+            more = num > 0 and (skip < total if total is not None else num >= page_size)
+            pending = (
+                ex.submit(_query_quickbase_page, token, table_id, qb_fields_dict, skip, page_size)
+                if more else None
+            )
+
+            for rec in records:
+                count += 1
+                yield _clean_quickbase_record(rec, fields)
+
+    log.info("Quickbase records cleaned: %s", count)
+
+
+def fetch_quickbase_records(token, table_id, qb_fields_dict, match_label=None):
+    """
+    Consume the cleaned QB row stream in one pass without keeping a row list.
+    Returns (count, lookup, ids); when match_label is given, lookup maps the
+    match value (as str) -> row and ids is the sorted list of those keys.
+    """
+    count = 0
+    lookup = {}
+
+    for row in iter_quickbase_records(token, table_id, qb_fields_dict):
+        count += 1
+        if match_label:
+            # rows are already cleaned: strings are stripped and never empty
+            k = row.get(match_label)
+            if k is None:
+                continue
+            lookup[k if isinstance(k, str) else str(k)] = row
+
+    return count, lookup, sorted(lookup)
 
 
 UNPARSEABLE_DATE = object()
 
+# YYYY-MM-DD | M/D/YYYY, M-D-YY (same separator twice) | YYYY/M/D
+_DATE_RE = re.compile(
+    r"^(?:(?P<y1>\d{4})-(?P<m1>\d{2})-(?P<d1>\d{2})"
+    r"|(?P<m2>\d{1,2})(?P<sep>[/-])(?P<d2>\d{1,2})(?P=sep)(?P<y2>\d{4}|\d{2})"
+    r"|(?P<y3>\d{4})/(?P<m3>\d{1,2})/(?P<d3>\d{1,2}))$"
+)
 
-def parse_qb_date(val):
-    if val is None:
-        return None
 
-    if isinstance(val, str):
-        s = val.strip()
-        if s == "":
-            return None
-        if s.lower() in {"<null>", "null", "none"}:
-            return None
+def _date_from_match(m):
+    g = m.group
+    if g("y1") is not None:
+        y, mo, d = g("y1"), g("m1"), g("d1")
+    elif g("y2") is not None:
+        y, mo, d = g("y2"), g("m2"), g("d2")
+    else:
+        y, mo, d = g("y3"), g("m3"), g("d3")
+
+    year = int(y)
+    if len(y) == 2:
+        # same pivot as strptime's %y: 69-99 -> 19xx, 00-68 -> 20xx
+        year += 1900 if year >= 69 else 2000
 
-        m = re.match(r"^(\d{4})-(\d{2})-(\d{2})$", s)
-        if m:
-            y, mo, d = map(int, m.groups())
-            try:
-                return dt.datetime(y, mo, d)
-            except Exception as e:
-                # log.warning("parse_qb_date datetime ctor failed: s=%r err=%r", s, e)
-                return UNPARSEABLE_DATE
+    try:
+        return dt.datetime(year, int(mo), int(d))
+    except ValueError:
+        return UNPARSEABLE_DATE
+
+
+@functools.lru_cache(maxsize=8192)
+def _parse_qb_date_str(val):
+    """String branch of parse_qb_date; QB date strings repeat heavily, so results are cached."""
+    s = val.strip()
+    if s == "":
+        return None
+    if s.lower() in {"<null>", "null", "none"}:
+        return None
 
+    # fast path for the common YYYY-MM-DD shape (C-level parse, no regex)
+    if len(s) == 10 and s[4] == "-" and s[7] == "-":
         try:
-            x = dt.datetime.fromisoformat(s.replace("Z", "+00:00"))
-            return x.replace(tzinfo=None)
-        except Exception:
+            return dt.datetime.fromisoformat(s)
+        except ValueError:
             pass
 
-        for fmt in ("%m/%d/%Y", "%m/%d/%y", "%m-%d-%Y", "%m-%d-%y", "%Y/%m/%d"):
-            try:
-                return dt.datetime.strptime(s, fmt)
-            except Exception:
-                continue
+    m = _DATE_RE.match(s)
+    if m:
+        return _date_from_match(m)
+
+    # timestamped values, e.g. 2024-01-09T00:00:00Z
+    try:
+        return _iso_parse(s).replace(tzinfo=None)
+    except Exception:
+        pass
+
+    return UNPARSEABLE_DATE
 
-        return UNPARSEABLE_DATE
+
+def parse_qb_date(val):
+    if val is None:
+        return None
+
+    if isinstance(val, str):
+        return _parse_qb_date_str(val)
 
     try:
         if isinstance(val, (int, float)):
@@ -288,61 +432,134 @@ def parse_qb_date(val):
     return UNPARSEABLE_DATE
 
 
-def update_arcgis_from_qb(layer, qb_data, features, batch_size=200):
+_EPOCH = dt.datetime(1970, 1, 1)
+
+
+def arc_to_datetime(val):
+    """ArcGIS date attribute (epoch ms or datetime) -> naive UTC datetime, for comparing with parse_qb_date."""
+    if val is None or val == "":
+        return None
+    if isinstance(val, dt.datetime):
+        if val.tzinfo is not None:
+            val = val.astimezone(dt.timezone.utc).replace(tzinfo=None)
+        return val
+    if isinstance(val, (int, float)):
+        return _EPOCH + dt.timedelta(milliseconds=val)
+    return None
+
+
+def update_arcgis_from_qb(layer, qb_lookup, features, arc_field_types, batch_size=200, max_workers=6):
     """
     Quickbase -> ArcGIS updates using MINIMAL payloads (OBJECTID + mapped fields only).
     This prevents unrelated fields (like MR_Ven) from being resent and causing errors.
 
+    - qb_lookup: QB rows keyed by FDH_ID_QB
     - features: list of ArcGIS Feature objects already queried
+    - arc_field_types: Arc field name -> esriFieldType (helps sanitize values)
     - batch_size: edit_features batch size
+    - max_workers: edit_features batches sent concurrently
     """
 
-    # ---- Build QB lookup by FDH_ID ----
-    qb_lookup = {}
-    for r in qb_data:
-        k = r.get("FDH_ID_QB")
-        if k is None:
-            continue
-        k = str(k).strip()
-        if k:
-            qb_lookup[k] = r
-
-    # ---- Arc field type map (helps sanitize values) ----
-    arc_field_types = {f["name"]: f.get("type") for f in layer.properties.fields}
-
-    def normalize_qb_value(v):
-        if v is None or v == "":
-            return None
-        if isinstance(v, list):
-            if len(v) == 0:
-                return None
-            if len(v) == 1:
-                return v[0]
-            return ", ".join([str(x) for x in v if x not in (None, "")])
-        return v
-
-    def sanitize_arc_text(v):
-        v = normalize_qb_value(v)
-        if v is None:
-            return None
-        if isinstance(v, str):
-            s = v.strip()
-            if s.lower() in {"<null>", "null", "none", "n/a"}:
-                return None
-            if s.startswith("<") and s.endswith(">"):
-                return None
-            return s
-        return v
-
     def coerce_number(v):
-        v = normalize_qb_value(v)
-        if v is None or v == "":
+        if v is None:
             return None
         try:
             return float(v)
         except Exception:
             return None
 
+    # ---- Per-field handlers: (record, feat_attrs, out_attrs, rec_id) -> mutate out_attrs ----
+    def date_handler(qb_label, arc_field):
+        prefix = "fdh_cx" if arc_field == "CX_Date" else "fdh_ofs"
+        k_cleared, k_noop = prefix + "_cleared", prefix + "_clear_noop_already_null"
+        k_unparseable, k_set = prefix + "_unparseable", prefix + "_set"
+
+        def handle(record, feat_attrs, out_attrs, rec_id):
+            raw_date = record.get(qb_label)
+            parsed_dt = parse_qb_date(raw_date)
+
+            if parsed_dt is None:
+                arc_before = feat_attrs.get(arc_field)
+
+                # Only clear if Arc currently has something
+                if arc_before not in (None, "", 0):
+                    out_attrs[arc_field] = None
+                    METRICS[k_cleared] += 1
+
+                    log.info(
+                        "DATE CLEAR | FDH_ID=%s field=%s qb_raw=%r arc_before=%r",
+                        rec_id, arc_field, raw_date, arc_before
+                    )
+                else:
+                    # Arc already empty -> no-op (optional metric)
+                    METRICS[k_noop] += 1
+
+            elif parsed_dt is UNPARSEABLE_DATE:
+                METRICS[k_unparseable] += 1
+                # leave Arc unchanged: do not set field in out_attrs
+
+            elif parsed_dt == arc_to_datetime(feat_attrs.get(arc_field)):
+                METRICS["fdh_field_unchanged"] += 1
+
+            else:
+                out_attrs[arc_field] = parsed_dt
+                METRICS[k_set] += 1
+
+        return handle
+
+    def int_handler(qb_label, arc_field):
+        def handle(record, feat_attrs, out_attrs, rec_id):
+            num = coerce_number(record.get(qb_label))
+            if num is None:
+                return
+            new = int(round(num))
+            if new == feat_attrs.get(arc_field):
+                METRICS["fdh_field_unchanged"] += 1
+                return
+            out_attrs[arc_field] = new
+
+        return handle
+
+    def float_handler(qb_label, arc_field):
+        def handle(record, feat_attrs, out_attrs, rec_id):
+            num = coerce_number(record.get(qb_label))
+            if num is None:
+                return
+            new = float(num)
+            if new == feat_attrs.get(arc_field):
+                METRICS["fdh_field_unchanged"] += 1
+                return
+            out_attrs[arc_field] = new
+
+        return handle
+
+    def text_handler(qb_label, arc_field):
+        def handle(record, feat_attrs, out_attrs, rec_id):
+            # Strings/other: only set if meaningful (values were cleaned at fetch time)
+            v = record.get(qb_label)
+            if v in (None, ""):
+                return
+            if v == feat_attrs.get(arc_field):
+                METRICS["fdh_field_unchanged"] += 1
+                return
+            out_attrs[arc_field] = v
+
+        return handle
+
+    # ---- Pick each field's handler once, from the Arc schema ----
+    dispatch = []
+    for qb_label, arc_field in QB_TO_ARC_PAIRS:
+        arc_type = arc_field_types.get(arc_field)
+        if arc_field in ("CX_Date", "OFS_Date"):
+            make = date_handler
+        elif arc_type in ("esriFieldTypeInteger", "esriFieldTypeSmallInteger"):
+            make = int_handler
+        elif arc_type in ("esriFieldTypeDouble", "esriFieldTypeSingle"):
+            make = float_handler
+        else:
+            make = text_handler
+        dispatch.append(make(qb_label, arc_field))
+
     log.info("Arc features retrieved: %s", len(features))
     METRICS["fdh_arc_features"] = len(features)
 
@@ -353,21 +570,24 @@ def update_arcgis_from_qb(layer, qb_data, features, batch_size=200):
     skipped_no_oid = 0
 
     for feat in features:
-        rec_id = feat.attributes.get(MATCH_FIELD)
+        attrs = feat.attributes
+        rec_id = attrs.get(MATCH_FIELD)
         if not rec_id:
             skipped_no_id += 1
             METRICS["fdh_skipped_no_id"] += 1
             continue
 
-        rec_id = str(rec_id).strip()
-        record = qb_lookup.get(rec_id)
-        if not record:
+        # FDH_IDs come back from the service as clean strings; only coerce
+        # non-strings, matching how fetch_quickbase_records keys the lookup
+        if not isinstance(rec_id, str):
+            rec_id = str(rec_id)
+        if rec_id not in qb_lookup:
             skipped_no_qb_match += 1
             METRICS["fdh_skipped_no_qb_match"] += 1
-
             continue
+        record = qb_lookup[rec_id]
 
-        oid = feat.attributes.get("OBJECTID")
+        oid = attrs.get("OBJECTID")
         if oid is None:
             skipped_no_oid += 1
             METRICS["fdh_skipped_no_oid"] += 1
@@ -375,77 +595,8 @@ def update_arcgis_from_qb(layer, qb_data, features, batch_size=200):
 
         out_attrs = {"OBJECTID": oid, MATCH_FIELD: rec_id}  # include MATCH_FIELD for logging/debug
 
-        for qb_label in QB_TO_ARC_FIELDS:
-            arc_field = FIELD_MAPPING[qb_label]
-            raw = sanitize_arc_text(record.get(qb_label))
-
-            # Dates
-            if arc_field in ("CX_Date", "OFS_Date"):
-                raw_date = record.get(qb_label)
-                parsed_dt = parse_qb_date(raw_date)
-
-                if parsed_dt is None:
-                    arc_before = feat.attributes.get(arc_field)
-
-                    # Only clear if Arc currently has something
-                    if arc_before not in (None, "", 0):
-                        out_attrs[arc_field] = None
-
-                        if arc_field == "CX_Date":
-                            METRICS["fdh_cx_cleared"] += 1
-                        else:
-                            METRICS["fdh_ofs_cleared"] += 1
-
-                        log.info(
-                            "DATE CLEAR | FDH_ID=%s field=%s qb_raw=%r arc_before=%r",
-                            rec_id, arc_field, raw_date, arc_before
-                        )
-                    else:
-                        # Arc already empty -> no-op (optional metric)
-                        if arc_field == "CX_Date":
-                            METRICS["fdh_cx_clear_noop_already_null"] += 1
-                        else:
-                            METRICS["fdh_ofs_clear_noop_already_null"] += 1
-
-
-                elif parsed_dt is UNPARSEABLE_DATE:
-                    if arc_field == "CX_Date":
-                        METRICS["fdh_cx_unparseable"] += 1
-                    else:
-                        METRICS["fdh_ofs_unparseable"] += 1
-                    # leave Arc unchanged: do not set field in out_attrs
-
-                else:
-                    out_attrs[arc_field] = parsed_dt
-                    if arc_field == "CX_Date":
-                        METRICS["fdh_cx_set"] += 1
-                    else:
-                        METRICS["fdh_ofs_set"] += 1
-
-                continue
-
-            arc_type = arc_field_types.get(arc_field)
-
-            # Integers
-            if arc_type in ("esriFieldTypeInteger", "esriFieldTypeSmallInteger"):
-                num = coerce_number(raw)
-                if num is None:
-                    continue
-                out_attrs[arc_field] = int(round(num))
-                continue
-
-            # Doubles/Floats
-            if arc_type in ("esriFieldTypeDouble", "esriFieldTypeSingle"):
-                num = coerce_number(raw)
-                if num is None:
-                    continue
-                out_attrs[arc_field] = float(num)
-                continue
-
-            # Strings/other: only set if meaningful
-            if raw is None or raw == "":
-                continue
-            out_attrs[arc_field] = raw
+        for handler in dispatch:
+            handler(record, attrs, out_attrs, rec_id)
 
         # if "CX_Date" in out_attrs:
         #     log.info(
@@ -471,69 +622,114 @@ def update_arcgis_from_qb(layer, qb_data, features, batch_size=200):
         return
 
     # ---- Apply updates resiliently ----
-    log.info("Applying %s updates (batch_size=%s)", len(updates), batch_size)
+    log.info("Applying %s updates (batch_size=%s, workers=%s)", len(updates), batch_size, max_workers)
 
-    for i in range(0, len(updates), batch_size):
-        chunk = updates[i:i + batch_size]
-        try:
-            resp = layer.edit_features(updates=chunk) or {}
-            results = resp.get("updateResults", []) or []
-            ok = sum(1 for r in results if r.get("success"))
-            bad = len(results) - ok
+    def apply_batch(i, chunk):
+        # counts are kept per batch and merged by the caller (METRICS is not thread-safe)
+        counts = defaultdict(int)
 
-            METRICS["fdh_updated_ok"] += ok
-            METRICS["fdh_updated_failed"] += bad
-            if bad:
-                METRICS["errors"] += bad
+        def on_error(upd, e):
+            upd_attrs = upd.get("attributes", {})
+            oid = upd_attrs.get("OBJECTID")
+            fdh = upd_attrs.get(MATCH_FIELD)
 
-            log.info("Updated %s-%s | ok=%s failed=%s", i + 1, i + len(chunk), ok, bad)
+            # log only the mapped fields we attempted to send
+            outbound = {arc_field: upd_attrs.get(arc_field) for _, arc_field in QB_TO_ARC_PAIRS}
 
-        except Exception as e:
-            METRICS["fdh_updated_failed"] += len(chunk)
-            METRICS["errors"] += len(chunk)
+            counts["fdh_updated_failed"] += 1
+            counts["errors"] += 1
 
-            log.error("Batch %s-%s failed: %s", i + 1, i + len(chunk), e)
+            log.error(
+                "FAILED OBJECTID=%s %s=%s error=%s outbound=%r",
+                oid, MATCH_FIELD, fdh, e, outbound
+            )
 
-            # Fallback: one-by-one to identify offenders
-            for upd in chunk:
-                try:
-                    layer.edit_features(updates=[upd])
-                except Exception as e2:
-                    attrs = upd.get("attributes", {})
-                    oid = attrs.get("OBJECTID")
-                    fdh = attrs.get(MATCH_FIELD)
+        results = bisect_edit_features(layer, chunk, on_error)
+        ok = sum(1 for r in results if r.get("success"))
+        bad = len(results) - ok
 
-                    # log only the mapped fields we attempted to send
-                    outbound = {FIELD_MAPPING[qb]: attrs.get(FIELD_MAPPING[qb]) for qb in QB_TO_ARC_FIELDS}
+        counts["fdh_updated_ok"] += ok
+        counts["fdh_updated_failed"] += bad
+        if bad:
+            counts["errors"] += bad
 
-                    METRICS["fdh_updated_failed"] += 1
-                    METRICS["errors"] += 1
+        log.info("Updated %s-%s | ok=%s failed=%s", i + 1, i + len(chunk), ok, counts["fdh_updated_failed"])
+
+        return counts
+
+    with ThreadPoolExecutor(max_workers=max_workers) as ex:
+        futs = [ex.submit(apply_batch, i, updates[i:i + batch_size]) for i in range(0, len(updates), batch_size)]
+        for f in as_completed(futs):
+            for k, v in f.result().items():
+                METRICS[k] += v
 
-                    log.error(
-                        "FAILED OBJECTID=%s %s=%s error=%s outbound=%r",
-                        oid, MATCH_FIELD, fdh, e2, outbound
-                    )
-                    continue
 
+def _is_request_level_error(e):
+    """Connection/timeout, auth or 5xx errors: caused by the request, not by the records in it."""
+    if isinstance(e, (requests.exceptions.ConnectionError, requests.exceptions.Timeout)):
+        return True
+    if isinstance(e, requests.exceptions.HTTPError):
+        status = getattr(e.response, "status_code", None)
+        return status in (401, 403) or (status is not None and status >= 500)
+    return False
+
+
+def bisect_edit_features(layer, updates, on_error):
+    """
+    Apply updates with edit_features; if the call raises, split the batch in half and
+    retry each half, so a few bad records cost ~2*log2(n) calls instead of n.
+    Request-level errors fail the whole batch without splitting (retrying halves won't help).
+    Updates that end up failed are passed to on_error(update, exc).
+    Returns the combined updateResults of the calls that went through.
+    """
+    try:
+        resp = layer.edit_features(updates=updates) or {}
+        return resp.get("updateResults", []) or []
+    except Exception as e:
+        if len(updates) == 1:
+            on_error(updates[0], e)
+            return []
+
+        if _is_request_level_error(e):
+            log.error("edit_features request failed for %s updates, not splitting: %s", len(updates), e)
+            for upd in updates:
+                on_error(upd, e)
+            return []
+
+        log.warning("edit_features failed for %s updates, splitting: %s", len(updates), e)
+        mid = len(updates) // 2
+        return (
+            bisect_edit_features(layer, updates[:mid], on_error)
+            + bisect_edit_features(layer, updates[mid:], on_error)
+        )
+
+
+def _query_one(layer, match_field, chunk, start, out_fields="*"):
+    quoted = "'" + "','".join(map(str, chunk)) + "'"
+    where = f"{match_field} IN ({quoted})"
+    res = layer.query(where=where, out_fields=out_fields, return_geometry=False)
+    feats = getattr(res, "features", [])
+    log.info("Queried chunk %s-%s -> %s features", start + 1, start + len(chunk), len(feats))
+    return feats
+
+
+def chunked_arc_query(layer, match_field, ids, chunk_size=250, max_workers=8, out_fields="*"):
+    """Query features by ID in chunks, running the chunk queries concurrently (result order is not preserved)."""
+    chunks = [(ids[i:i+chunk_size], i) for i in range(0, len(ids), chunk_size)]
 
-def chunked_arc_query(layer, match_field, ids, chunk_size=250):
     features = []
-    for i in range(0, len(ids), chunk_size):
-        chunk = ids[i:i+chunk_size]
-        quoted = ",".join([f"'{x}'" for x in chunk])
-        where = f"{match_field} IN ({quoted})"
-        res = layer.query(where=where, return_geometry=False)
-        feats = getattr(res, "features", [])
-        features.extend(feats)
-        log.info("Queried chunk %s-%s -> %s features", i+1, min(i+chunk_size, len(ids)), len(feats))
+    with ThreadPoolExecutor(max_workers=max_workers) as ex:
+        futs = [ex.submit(_query_one, layer, match_field, chunk, start, out_fields) for chunk, start in chunks]
+        for f in as_completed(futs):
+            features.extend(f.result())
     return features
 
 
 def run_fdh_sync(gis, qb_token, batch_size=200, dry_run=False, fdh_ids=None):
     log.info("==== FDH Sync starting ====")
 
-    qb_rows = fetch_quickbase_records(qb_token, QB_TABLE_ID, QB_FIELDS)
-    METRICS["fdh_qb_rows"] = len(qb_rows)
+    qb_count, qb_lookup, qb_ids = fetch_quickbase_records(qb_token, QB_TABLE_ID, QB_FIELDS, match_label="FDH_ID_QB")
+    METRICS["fdh_qb_rows"] = qb_count
 
     item = gis.content.get(LAYER_ITEM_ID)
     if not item:
@@ -547,6 +743,17 @@ def run_fdh_sync(gis, qb_token, batch_size=200, dry_run=False, fdh_ids=None):
     
     layer = item.layers[0]
 
+    # ---- Arc field type map, read once and limited to the fields we touch ----
+    needed = set(FIELD_MAPPING.values()) | {"OBJECTID", MATCH_FIELD}
+    arc_field_types = {f["name"]: f.get("type") for f in layer.properties.fields if f["name"] in needed}
+
+    missing = sorted(needed - arc_field_types.keys())
+    if missing:
+        log.warning("FDH layer is missing mapped fields (not queried): %s", missing)
+
+    # query only the attributes the sync reads/writes that actually exist on the layer
+    out_fields = ",".join(arc_field_types) or "*"
+
     try:
         test = layer.query(where="1=1", return_geometry=False, result_record_count=1)
         log.info("Basic query OK. Returned %s feature(s).", len(test.features))
@@ -562,13 +769,12 @@ def run_fdh_sync(gis, qb_token, batch_size=200, dry_run=False, fdh_ids=None):
 
     if fdh_ids:
         # debug override
-        quoted = ",".join([f"'{x}'" for x in fdh_ids])
+        quoted = "'" + "','".join(map(str, fdh_ids)) + "'"
         where = f"{MATCH_FIELD} IN ({quoted})"
-        features = layer.query(where=where, return_geometry=False).features
+        features = layer.query(where=where, out_fields=out_fields, return_geometry=False).features
         log.info("FDH override: syncing %s FDHs from --fdh-ids", len(features))
     else:
-        qb_ids = sorted(set(str(r.get("FDH_ID_QB")).strip() for r in qb_rows if r.get("FDH_ID_QB")))
-        features = chunked_arc_query(layer, MATCH_FIELD, qb_ids, chunk_size=25)
+        features = chunked_arc_query(layer, MATCH_FIELD, qb_ids, chunk_size=25, out_fields=out_fields)
 
     METRICS["fdh_arc_features"] = len(features)
 
@@ -576,23 +782,33 @@ def run_fdh_sync(gis, qb_token, batch_size=200, dry_run=False, fdh_ids=None):
         log.info("FDH dry-run: would process %s features", len(features))
         return
 
-    update_arcgis_from_qb(layer, qb_rows, features, batch_size=batch_size)
+    update_arcgis_from_qb(layer, qb_lookup, features, arc_field_types, batch_size=batch_size)
     log.info("==== FDH Sync finished ====")
 
 
 def run_mdu_sync(gis, qb_token, batch_size=200, dry_run=False):
     log.info("==== MDU Sync starting ====")
 
-    qb_rows = fetch_quickbase_records(qb_token, MDU_TABLE_ID, MDU_QB_FIELDS)
-    METRICS["mdu_qb_rows"] = len(qb_rows)
+    qb_count, qb_lookup, qb_ids = fetch_quickbase_records(qb_token, MDU_TABLE_ID, MDU_QB_FIELDS, match_label="MDU ID")
+    METRICS["mdu_qb_rows"] = qb_count
 
     item = gis.content.get(MDU_LAYER_ITEM_ID)
     if not item:
         raise SystemExit(f"Could not find MDU ArcGIS item {MDU_LAYER_ITEM_ID}")
     layer = item.layers[0]
 
-    qb_ids = sorted(set(str(r.get("MDU ID")).strip() for r in qb_rows if r.get("MDU ID")))
-    features = chunked_arc_query(layer, MDU_MATCH_FIELD, qb_ids, chunk_size=25)
+    # ---- Arc field type map, read once and limited to the fields we touch ----
+    needed = set(MDU_FIELD_MAPPING.values()) | {"OBJECTID", MDU_MATCH_FIELD}
+    arc_field_types = {f["name"]: f.get("type") for f in layer.properties.fields if f["name"] in needed}
+
+    missing = sorted(needed - arc_field_types.keys())
+    if missing:
+        log.warning("MDU layer is missing mapped fields (not queried): %s", missing)
+
+    # query only the attributes the sync reads/writes that actually exist on the layer
+    out_fields = ",".join(arc_field_types) or "*"
+
+    features = chunked_arc_query(layer, MDU_MATCH_FIELD, qb_ids, chunk_size=25, out_fields=out_fields)
 
     METRICS["mdu_arc_features"] = len(features)
 
@@ -600,7 +816,7 @@ def run_mdu_sync(gis, qb_token, batch_size=200, dry_run=False):
         log.info("MDU dry-run: would process %s features", len(features))
         return
 
-    update_mdu_arcgis_from_qb(layer, qb_rows, features, batch_size=batch_size)
+    update_mdu_arcgis_from_qb(layer, qb_lookup, features, arc_field_types, batch_size=batch_size)
     log.info("==== MDU Sync finished ====")
 
 
@@ -613,66 +829,25 @@ def qb_checkbox_value(val):
     return s in ("1", "true", "yes", "y", "checked")
 
 
-def update_mdu_arcgis_from_qb(layer, qb_rows, features, batch_size=200):
+def update_mdu_arcgis_from_qb(layer, qb_lookup, features, arc_field_types, batch_size=200):
     """
     Quickbase -> ArcGIS (MDU) updates using MINIMAL payloads.
+    - qb_lookup: QB rows keyed by MDU ID
+    - arc_field_types: Arc field name -> esriFieldType (helps sanitize values)
     - Only sends OBJECTID + mapped fields.
     - Logs applyEdits success/fail counts.
     """
 
-    # ---- QB lookup by MDU ID ----
-    qb_lookup = {}
-    for r in qb_rows:
-        k = r.get("MDU ID")
-        if k is None:
-            continue
-        k = str(k).strip()
-        if k:
-            qb_lookup[k] = r
-
-    # ---- Arc field type map (helps sanitize values) ----
-    arc_field_types = {f["name"]: f.get("type") for f in layer.properties.fields}
-
-    def normalize_qb_value(v):
-        """Convert QB shapes into simple scalars suitable for ArcGIS."""
-        if v is None or v == "":
-            return None
-        if isinstance(v, list):
-            if len(v) == 0:
-                return None
-            if len(v) == 1:
-                return v[0]
-            return ", ".join([str(x) for x in v if x not in (None, "")])
-        return v
-
-    def sanitize_arc_text(v):
-        """Remove QB null sentinels and angle-bracket tokens like <Null>."""
-        v = normalize_qb_value(v)
-        if v is None:
-            return None
-        if isinstance(v, str):
-            s = v.strip()
-            if s.lower() in {"<null>", "null", "none", "n/a"}:
-                return None
-            if s.startswith("<") and s.endswith(">"):
-                return None
-            return s
-        return v
-
     def coerce_number(v):
         """Try to coerce QB value into float; return None if not possible."""
-        v = normalize_qb_value(v)
-        if v is None or v == "":
+        if v is None:
             return None
         try:
             return float(v)
         except Exception:
             return None
 
-    def apply_updates(layer, updates, label="MDU"):
-        resp = layer.edit_features(updates=updates) or {}
-        results = resp.get("updateResults", []) or []
-
+    def record_results(results, label="MDU"):
         ok = sum(1 for r in results if r.get("success"))
         failed_results = [r for r in results if not r.get("success")]
         bad = len(failed_results)
@@ -687,7 +862,11 @@ def update_mdu_arcgis_from_qb(layer, qb_rows, features, batch_size=200):
         for r in failed_results[:5]:
             log.error("%s applyEdits failure: oid=%s error=%s", label, r.get("objectId"), r.get("error"))
 
-        return resp
+    def on_error(u, e):
+        METRICS["mdu_updated_failed"] += 1
+        METRICS["errors"] += 1
+        oid = u.get("attributes", {}).get("OBJECTID")
+        log.error("MDU FAILED OBJECTID=%s error=%s outbound=%r", oid, e, u.get("attributes"))
 
     log.info("Arc MDU features retrieved: %s", len(features))
 
@@ -709,54 +888,59 @@ def update_mdu_arcgis_from_qb(layer, qb_rows, features, batch_size=200):
             continue
         mdu_id = str(mdu_id).strip()
 
-        rec = qb_lookup.get(mdu_id)
-        if not rec:
+        if mdu_id not in qb_lookup:
             skipped_no_match += 1
             continue
+        rec = qb_lookup[mdu_id]
 
         out_attrs = {"OBJECTID": oid}
 
         for qb_label, arc_field in MDU_FIELD_MAPPING.items():
-            raw = sanitize_arc_text(rec.get(qb_label))
+            raw = rec.get(qb_label)  # already cleaned by iter_quickbase_records
+            current = attrs.get(arc_field)
 
             # ROE checkbox -> Y/N
             if qb_label == "ROE?":
-                out_attrs[arc_field] = "Y" if qb_checkbox_value(raw) else "N"
-                continue
+                new = "Y" if qb_checkbox_value(raw) else "N"
 
             # Date
-            if qb_label == "ROE Date":
+            elif qb_label == "ROE Date":
                 parsed_dt = parse_qb_date(raw)
-                if parsed_dt is None:
-                    out_attrs[arc_field] = None
-                elif parsed_dt is UNPARSEABLE_DATE:
+                if parsed_dt is UNPARSEABLE_DATE:
                     METRICS["errors"] += 1
                     log.warning("MDU DATE SKIP (unparseable) | MDU_ID=%s raw=%r", mdu_id, raw)
                     # leave unchanged (don’t include field)
-                else:
-                    out_attrs[arc_field] = parsed_dt
-                continue
-
-            # Numeric coercion based on Arc field type
-            arc_type = arc_field_types.get(arc_field)
-
-            if arc_type in ("esriFieldTypeInteger", "esriFieldTypeSmallInteger"):
-                num = coerce_number(raw)
-                if num is None:
                     continue
-                out_attrs[arc_field] = int(round(num))
-                continue
+                new = parsed_dt
+                current = arc_to_datetime(current)
+
+            else:
+                # Numeric coercion based on Arc field type
+                arc_type = arc_field_types.get(arc_field)
+
+                if arc_type in ("esriFieldTypeInteger", "esriFieldTypeSmallInteger"):
+                    num = coerce_number(raw)
+                    if num is None:
+                        continue
+                    new = int(round(num))
+
+                elif arc_type in ("esriFieldTypeDouble", "esriFieldTypeSingle"):
+                    num = coerce_number(raw)
+                    if num is None:
+                        continue
+                    new = float(num)
+
+                # Strings and other types
+                else:
+                    if raw in (None, ""):
+                        continue
+                    new = raw
 
-            if arc_type in ("esriFieldTypeDouble", "esriFieldTypeSingle"):
-                num = coerce_number(raw)
-                if num is None:
-                    continue
-                out_attrs[arc_field] = float(num)
+            # Arc already holds this value -> don't resend it
+            if new == current:
+                METRICS["mdu_field_unchanged"] += 1
                 continue
-
-            # Strings and other types
-            if raw is not None and raw != "":
-                out_attrs[arc_field] = raw
+            out_attrs[arc_field] = new
 
         # Only send if we have something besides OBJECTID
         if len(out_attrs) > 1:
@@ -773,21 +957,11 @@ def update_mdu_arcgis_from_qb(layer, qb_rows, features, batch_size=200):
         log.info("No MDU updates to apply.")
         return
 
-    # ---- Apply edits in batches, fallback to single-item to find offenders ----
+    # ---- Apply edits in batches, bisecting failed batches to find offenders ----
     for i in range(0, len(updates), batch_size):
         chunk = updates[i:i + batch_size]
-        try:
-            apply_updates(layer, chunk, label=f"MDU {i+1}-{i+len(chunk)}")
-        except Exception as e:
-            log.error("MDU batch %s-%s threw exception: %s", i+1, i+len(chunk), e)
-
-            # one-by-one fallback
-            for u in chunk:
-                try:
-                    apply_updates(layer, [u], label="MDU single")
-                except Exception as e2:
-                    oid = u.get("attributes", {}).get("OBJECTID")
-                    log.error("MDU FAILED OBJECTID=%s error=%s outbound=%r", oid, e2, u.get("attributes"))
+        results = bisect_edit_features(layer, chunk, on_error)
+        record_results(results, label=f"MDU {i+1}-{i+len(chunk)}")
 
 
 def main():